@@ -34,7 +34,6 @@ import logging
 import numbers
 
 import numpy as np
-from scipy.interpolate import interp1d
 from sympl import DataArray
 
 from konrad.component import Component
@@ -67,12 +66,62 @@ def get_rectangular_profile(z, value, ztop, depth):
             ztop - depth gives the base of the rectangle
     """
     p = np.zeros(z.shape)
-    inrectangle = np.logical_and(z < ztop, z > ztop - depth)
-    p[inrectangle] = value
+    zbase = ztop - depth
+
+    # For a sorted one-dimensional height, the rectangle is a contiguous
+    # slice whose bounds can be found by binary search.
+    if z.ndim == 1 and np.all(z[1:] >= z[:-1]):
+        start = np.searchsorted(z, zbase, side='right')
+        stop = np.searchsorted(z, ztop, side='left')
+        p[start:stop] = value
+    elif z.ndim == 1 and np.all(z[1:] <= z[:-1]):
+        start = np.searchsorted(-z, -ztop, side='right')
+        stop = np.searchsorted(-z, -zbase, side='left')
+        p[start:stop] = value
+    else:
+        inrectangle = z < ztop
+        inrectangle &= z > zbase
+        p[inrectangle] = value
 
     return p
 
 
+class _LinearMultiInterp:
+    """Linear interpolation of several profiles sharing the same grid.
+
+    All columns of ``fp`` are interpolated at once by locating the grid
+    segments a single time. The slopes of all segments are computed on
+    initialization. Values outside of the grid are set to zero.
+    """
+    def __init__(self, xp, fp, axis=0):
+        """
+        Parameters:
+            xp (ndarray): Strictly increasing grid of length N.
+            fp (ndarray): Values on the grid, the size of dimension ``axis``
+                has to be N.
+            axis (int): Axis of ``fp`` along which to interpolate.
+        """
+        self.xp = np.asarray(xp, dtype=float)
+        self.fp = np.moveaxis(np.array(fp, dtype=float), axis, 0)
+        self.axis = axis
+
+        dx = np.diff(self.xp).reshape((-1,) + (1,) * (self.fp.ndim - 1))
+        self.slopes = np.diff(self.fp, axis=0) / dx
+
+    def __call__(self, x):
+        xp, fp = self.xp, self.fp
+        x = np.asarray(x, dtype=float)
+
+        idx = np.clip(np.searchsorted(xp, x) - 1, 0, xp.size - 2)
+        dx = x - xp[idx]
+        dx = dx.reshape(dx.shape + (1,) * (fp.ndim - 1))
+
+        out = fp[idx] + dx * self.slopes[idx]
+        out[(x < xp[0]) | (x > xp[-1])] = 0
+
+        return np.moveaxis(out, 0, self.axis)
+
+
 class Cloud(Component, metaclass=abc.ABCMeta):
     """Base class to define abstract methods for all cloud handlers.
     Default properties include a cloud area fraction equal to zero everywhere
@@ -84,6 +133,9 @@ class Cloud(Component, metaclass=abc.ABCMeta):
     #: number of shortwave bands used in the radiation scheme
     num_shortwave_bands = 14
 
+    # Version of the cloud profile, see `__setitem__`.
+    _profile_version = 0
+
     def __init__(self, numlevels, cloud_fraction=0, mass_ice=0, mass_water=0,
                  ice_particle_size=20, droplet_radius=10,
                  lw_optical_thickness=0, sw_optical_thickness=0,
@@ -180,8 +232,15 @@ class Cloud(Component, metaclass=abc.ABCMeta):
                 (droplet_radius, 'micrometers'),
         }
 
-        for name, (var, unit) in physical_props.items():
-            dataarray = self.get_p_data_array(var, units=unit)
+        # All cloud properties are stored in contiguous blocks of memory:
+        # one block for the physical properties and one for the optical
+        # properties of each spectral range. The DataArrays are views on
+        # single rows of these blocks.
+        self._physical_props = np.empty((len(physical_props), self.numlevels))
+
+        for out, (name, (var, unit)) in zip(self._physical_props,
+                                            physical_props.items()):
+            dataarray = self.get_p_data_array(var, units=unit, out=out)
             self[name] = dataarray.dims, dataarray
 
         cloud_optics = {
@@ -197,17 +256,51 @@ class Cloud(Component, metaclass=abc.ABCMeta):
                 (single_scattering_albedo, 'dimensionless', True),
         }
 
+        num_sw_props = sum(is_sw for _, _, is_sw in cloud_optics.values())
+        self._longwave_optics = np.empty((
+            len(cloud_optics) - num_sw_props,
+            self.numlevels,
+            self.num_longwave_bands,
+        ))
+        self._shortwave_optics = np.empty((
+            num_sw_props,
+            self.numlevels,
+            self.num_shortwave_bands,
+        ))
+
+        lw_rows = iter(self._longwave_optics)
+        sw_rows = iter(self._shortwave_optics)
         for name, (var, unit, is_sw) in cloud_optics.items():
-            dataarray = self.get_waveband_data_array(var, units=unit, sw=is_sw)
+            out = next(sw_rows) if is_sw else next(lw_rows)
+            dataarray = self.get_waveband_data_array(
+                var, units=unit, sw=is_sw, out=out)
             self[name] = dataarray.dims, dataarray
 
         self._rrtmg_cloud_optical_properties = rrtmg_cloud_optical_properties
         self._rrtmg_cloud_ice_properties = rrtmg_cloud_ice_properties
 
-    def get_p_data_array(self, values, units='kg m^-2'):
-        """Return a DataArray of values."""
+        # Counter that is increased whenever the cloud profile changes. Cloud
+        # ensembles compare it to detect changes of their members.
+        self._profile_version = 0
+
+    def get_p_data_array(self, values, units='kg m^-2', out=None):
+        """Return a DataArray of values.
+
+        If an output array ``out`` is given, the values are written into it
+        and the returned DataArray is a view on ``out``.
+        """
         if isinstance(values, DataArray):
-            return values
+            if out is None:
+                return values
+            if values.shape != out.shape:
+                raise ValueError(
+                    'shape mismatch: Shape of cloud parameter input array '
+                    f'{values.shape} is not compatible with number of model '
+                    f'levels ({self.numlevels},).'
+                )
+            np.copyto(out, values.values)
+            return DataArray(out, dims=values.dims, coords=values.coords,
+                             name=values.name, attrs=values.attrs)
         elif isinstance(values, np.ndarray):
             if values.shape != (self.numlevels,):
                 raise ValueError(
@@ -216,19 +309,39 @@ class Cloud(Component, metaclass=abc.ABCMeta):
                     f'levels ({self.numlevels},).'
                 )
         elif isinstance(values, numbers.Number):
-            values = values * np.ones(self.numlevels,)
+            if out is None:
+                values = np.full(self.numlevels, values, dtype=float)
         else:
             raise TypeError(
                 'Cloud variable input must be a single value, '
                 '`numpy.ndarray` or a `sympl.DataArray`'
             )
 
+        if out is not None:
+            np.copyto(out, values)
+            values = out
+
         return DataArray(values, dims=('mid_levels',), attrs={'units': units})
 
-    def get_waveband_data_array(self, values, units='dimensionless', sw=True):
-        """Return a DataArray of values."""
+    def get_waveband_data_array(self, values, units='dimensionless', sw=True,
+                                out=None):
+        """Return a DataArray of values.
+
+        If an output array ``out`` is given, the values are written into it
+        and the returned DataArray is a view on ``out``.
+        """
         if isinstance(values, DataArray):
-            return values
+            if out is None:
+                return values
+            if values.shape != out.shape:
+                raise ValueError(
+                    f'shape mismatch: input array of shape {values.shape} '
+                    'is not supported. Allowed shape for DataArrays is '
+                    f'{out.shape}.'
+                )
+            np.copyto(out, values.values)
+            return DataArray(out, dims=values.dims, coords=values.coords,
+                             name=values.name, attrs=values.attrs)
 
         if sw:
             dims = ('mid_levels', 'num_shortwave_bands')
@@ -237,30 +350,56 @@ class Cloud(Component, metaclass=abc.ABCMeta):
             dims = ('mid_levels', 'num_longwave_bands')
             numbands = self.num_longwave_bands
 
+        shape = (self.numlevels, numbands)
         if isinstance(values, numbers.Number):
-            values = values * np.ones((self.numlevels, numbands))
+            if out is None:
+                values = np.full(shape, values, dtype=float)
         elif isinstance(values, np.ndarray):
             if values.shape == (self.numlevels,):
-                values = np.repeat(
-                    values[:, np.newaxis], numbands, axis=1)
+                values = values[:, np.newaxis]
             elif values.shape == (numbands,):
-                values = np.repeat(
-                    values[np.newaxis, :], self.numlevels, axis=0)
-            elif not values.shape == (self.numlevels, numbands):
+                values = values[np.newaxis, :]
+            elif not values.shape == shape:
                 raise ValueError(
                     f'shape mismatch: input array of shape {values.shape} '
                     'is not supported. Allowed shapes are: '
                     f'({self.numlevels},), ({numbands},), or '
                     f'({self.numlevels}, {numbands}).'
                 )
+
+            # Cloud properties are modified in place (e.g. when shifting the
+            # cloud), therefore, the broadcasted views have to be copied.
+            if out is None and values.shape != shape:
+                values = np.broadcast_to(values, shape).copy()
         else:
             raise TypeError(
                 'Cloud variable input must be a single value, '
                 '`numpy.ndarray` or a `sympl.DataArray`'
             )
 
+        if out is not None:
+            np.copyto(out, values)
+            values = out
+
         return DataArray(values, dims=dims, attrs={'units': units})
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        # Increase the profile version so that cloud ensembles containing this
+        # cloud notice the change.
+        self._profile_version += 1
+
+    def set(self, variable, value):
+        """Set the values of a variable.
+
+        Parameters:
+            variable (str): Variable key.
+            value (float or ndarray): Value to assign to the variable.
+                If a float is given, all values are filled with it.
+        """
+        super().set(variable, value)
+        self._profile_version += 1
+
     @classmethod
     def from_atmosphere(cls, atmosphere, **kwargs):
         """Initialize a cloud component matching the given atmosphere.
@@ -339,6 +478,22 @@ class DirectInputCloud(Cloud):
         'single_scattering_albedo_due_to_cloud',
     }
 
+    #: mapping of keyword arguments to the variables used for superpositions
+    _superposition_name_map = (
+        ('cloud_fraction',
+         'cloud_area_fraction_in_atmosphere_layer'),
+        ('lw_optical_thickness',
+         'longwave_optical_thickness_due_to_cloud'),
+        ('sw_optical_thickness',
+         'shortwave_optical_thickness_due_to_cloud'),
+        ('forward_scattering_fraction',
+         'cloud_forward_scattering_fraction'),
+        ('asymmetry_parameter',
+         'cloud_asymmetry_parameter'),
+        ('single_scattering_albedo',
+         'single_scattering_albedo_due_to_cloud'),
+    )
+
     def __init__(self, numlevels, cloud_fraction, lw_optical_thickness,
                  sw_optical_thickness, coupling='convective_top',
                  forward_scattering_fraction=0, asymmetry_parameter=0.85,
@@ -384,104 +539,138 @@ class DirectInputCloud(Cloud):
         )
 
         self._norm_index = norm_index
+        # Normalisation level at which the cloud profile is currently located.
+        self._norm_current = norm_index
         self._interp_cache = {}
+        # The level grid is fixed for a cloud instance, store it once instead
+        # of recreating it every time the cloud is shifted.
+        self._levels = np.arange(0, self.numlevels)
         self.coupling = coupling
 
     def __add__(self, other):
         """Define the superposition of two clouds in a layer."""
-        name_map = (
-            ('cloud_fraction',
-             'cloud_area_fraction_in_atmosphere_layer'),
-            ('lw_optical_thickness',
-             'longwave_optical_thickness_due_to_cloud'),
-            ('sw_optical_thickness',
-             'shortwave_optical_thickness_due_to_cloud'),
-            ('forward_scattering_fraction',
-             'cloud_forward_scattering_fraction'),
-            ('asymmetry_parameter',
-             'cloud_asymmetry_parameter'),
-            ('single_scattering_albedo',
-             'single_scattering_albedo_due_to_cloud'),
-        )
+        # Clouds share the level grid of the atmosphere. Comparing the number
+        # of levels is sufficient and avoids an elementwise comparison.
+        if self.numlevels != other.numlevels:
+            raise ValueError(
+                'Only clouds with the same number of levels can be superposed.'
+            )
 
         # The superposition of two clouds is implemented following a
         # "The winner takes it all"-approach:
         # For each cloud layer, the properties of the bigger cloud (in terms
         # of cloud fraction) is used.
         other_is_bigger = (
-                other['cloud_area_fraction_in_atmosphere_layer']
-                > self['cloud_area_fraction_in_atmosphere_layer']
+                other['cloud_area_fraction_in_atmosphere_layer'].values
+                > self['cloud_area_fraction_in_atmosphere_layer'].values
         )
 
         kwargs = {}
-        for kwname, varname in name_map:
+        for kwname, varname in self._superposition_name_map:
             arr = self[varname].values.copy()
-            arr[other_is_bigger] = other[varname][other_is_bigger]
+            # Broadcast the level mask along the waveband dimension.
+            mask = other_is_bigger.reshape((-1,) + (1,) * (arr.ndim - 1))
+            np.copyto(arr, other[varname].values, where=mask)
             kwargs[kwname] = arr
 
         summed_cloud = DirectInputCloud(numlevels=self.numlevels, **kwargs)
 
         return summed_cloud
 
-    def interpolation_function(self, cloud_parameter):
+    def interpolation_function(self, cloud_parameter, axis=0):
         """ Calculate the interpolation function, to be used to maintain the
         cloud optical properties and keep the cloud attached to a normalisation
         level (self._norm_index). A separate interpolation function is required
         for each cloud parameter that needs to be interpolated.
 
         Parameters:
-            cloud_parameter (DataArray): property to be interpolation
+            cloud_parameter (DataArray / ndarray): property to be
+                interpolated
+            axis (int): axis of the model levels in `cloud_parameter`
         Returns:
-            scipy.interpolate.interpolate.interp1d
+            callable: linear interpolation along the level axis, returning
+            zero outside of the original cloud profile
         """
-        normed_levels = np.arange(0, self.numlevels) - self._norm_index
-
-        interpolation_f = interp1d(
-            normed_levels,
-            cloud_parameter.values,
-            fill_value=0,
-            bounds_error=False,
-            axis=0,
-        )
+        normed_levels = self._levels - self._norm_index
+        values = np.asarray(cloud_parameter)
+
+        if values.ndim > 1:
+            # Interpolate all wavebands at once.
+            return _LinearMultiInterp(normed_levels, values, axis=axis)
+
+        # Copy the values, as the cloud parameter is modified in place when
+        # the cloud is shifted.
+        values = values.copy()
+
+        def interpolation_f(x):
+            return np.interp(x, normed_levels, values, left=0, right=0)
+
         return interpolation_f
 
     def shift_property(self, cloud_parameter, interpolation_f, norm_new):
         """Shift the cloud area fraction according to a normalisation level.
 
         Parameters:
-            cloud_parameter (DataArray): cloud property to be shifted
-            interpolation_f (scipy.interpolate.interpolate.interp1d):
-                interpolation object calculated by interpolation_function
-            norm_new (int): normalisation index [model level]
+            cloud_parameter (DataArray / ndarray): cloud property to be
+                shifted
+            interpolation_f (callable): interpolation function calculated
+                by interpolation_function
+            norm_new (int / None): normalisation index [model level],
+                `None` or NaN to keep the cloud at its original position
 
         Returns:
-            DataArray: shifted cloud property
+            DataArray / ndarray: shifted cloud property
         """
-        levels = np.arange(0, self.numlevels)
-        if not np.isnan(norm_new):
+        levels = self._levels
+        # The values are updated in place to keep the DataArray a view on the
+        # cloud's contiguous property blocks.
+        values = np.asarray(cloud_parameter)
+        if norm_new is not None and not np.isnan(norm_new):
             # Move the cloud to the new normalisation level, if there is one.
-            cloud_parameter.values = interpolation_f(levels - norm_new)
+            values[...] = interpolation_f(levels - norm_new)
         else:
             # Otherwise keep the cloud where it is.
-            cloud_parameter.values = interpolation_f(levels - self._norm_index)
+            values[...] = interpolation_f(levels - self._norm_index)
 
         return cloud_parameter
 
     def shift_cloud_profile(self, norm_new):
         if self._norm_index is None:
-            self._norm_index = norm_new
+            # The cloud profile is already located at the first normalisation
+            # level it is coupled to.
+            self._norm_index = self._norm_current = norm_new
+
+        if norm_new is None or np.isnan(norm_new):
+            # Keep the cloud at its original position.
+            norm_new = self._norm_index
+
+        if norm_new == self._norm_current:
+            # Skip the interpolation if the cloud has not moved.
+            return
+
+        # The optical properties (see `direct_input_parameters`) of each
+        # spectral range are shifted at once using their contiguous blocks.
+        shifted_props = (
+            ('cloud_area_fraction_in_atmosphere_layer',
+             self['cloud_area_fraction_in_atmosphere_layer'], 0),
+            ('longwave_optics', self._longwave_optics, 1),
+            ('shortwave_optics', self._shortwave_optics, 1),
+        )
 
-        for varname in self.direct_input_parameters:
-            if varname not in self._interp_cache:
-                self._interp_cache[varname] = self.interpolation_function(
-                    cloud_parameter=self[varname])
+        for key, cloud_parameter, axis in shifted_props:
+            if key not in self._interp_cache:
+                self._interp_cache[key] = self.interpolation_function(
+                    cloud_parameter=cloud_parameter, axis=axis)
 
-            self[varname][:] = self.shift_property(
-                cloud_parameter=self[varname],
-                interpolation_f=self._interp_cache[varname],
+            self.shift_property(
+                cloud_parameter=cloud_parameter,
+                interpolation_f=self._interp_cache[key],
                 norm_new=norm_new,
             )
 
+        self._norm_current = norm_new
+        self._profile_version += 1
+
     def update_cloud_profile(self, atmosphere, convection, radiation,
                              **kwargs):
         """Keep the cloud profile fixed with model level (pressure). """
@@ -554,10 +743,16 @@ class CloudEnsemble(DirectInputCloud):
         if not all([isinstance(a, DirectInputCloud) for a in args]):
             raise ValueError(
                 'Only `DirectInputCloud`s can be combined in an ensemble.')
+        elif len({a.numlevels for a in args}) > 1:
+            raise ValueError(
+                'Only clouds with the same number of levels can be combined '
+                'in an ensemble.')
         else:
             self._clouds = args
 
         self._superposition = None
+        self._superposed_versions = None
+        self._profile_version = 0
         self.superpose()
 
         self.coords = self._superposition.coords
@@ -573,7 +768,57 @@ class CloudEnsemble(DirectInputCloud):
 
     def superpose(self):
         """Update the superposed cloud profile."""
-        self._superposition = np.sum(self._clouds)
+        if len(self._clouds) == 1:
+            self._superposition = self._clouds[0]
+        else:
+            self._superposition = self._superpose_fast()
+
+        # Remember the state of the clouds used for this superposition.
+        self._superposed_versions = self._cloud_versions()
+
+    def _cloud_versions(self):
+        """Return the profile versions of all clouds in the ensemble."""
+        return tuple(cloud._profile_version for cloud in self._clouds)
+
+    def _superpose_fast(self):
+        """Superpose all clouds in a single pass.
+
+        The result is equivalent to adding up all clouds (see
+        :py:meth:`DirectInputCloud.__add__`) but avoids the creation of
+        intermediate clouds. The superposed cloud is only allocated once and
+        updated in place afterwards.
+        """
+        superposition = self._superposition
+        if superposition is None:
+            superposition = DirectInputCloud(
+                numlevels=self._clouds[0].numlevels,
+                cloud_fraction=0,
+                lw_optical_thickness=0,
+                sw_optical_thickness=0,
+            )
+
+        cloud_fractions = np.stack([
+            cloud['cloud_area_fraction_in_atmosphere_layer'].values
+            for cloud in self._clouds
+        ])
+
+        # In each layer, the first cloud with the biggest cloud fraction wins.
+        # This matches the successive pairwise superposition.
+        winner = np.argmax(cloud_fractions, axis=0)
+        levels = np.arange(winner.size)
+
+        superposition['cloud_area_fraction_in_atmosphere_layer'].values[:] = (
+            cloud_fractions[winner, levels])
+
+        # Gather the optical properties block-wise for each spectral range.
+        for block in ('_longwave_optics', '_shortwave_optics'):
+            stacked = np.stack(
+                [getattr(cloud, block) for cloud in self._clouds])
+            # The advanced indexing moves the level dimension to the front.
+            getattr(superposition, block)[...] = np.moveaxis(
+                stacked[winner, :, levels], 0, 1)
+
+        return superposition
 
     @property
     def attrs(self):
@@ -586,8 +831,19 @@ class CloudEnsemble(DirectInputCloud):
         return self._superposition._data_vars
 
     def update_cloud_profile(self, *args, **kwargs):
-        """Update every cloud in the cloud ensemble."""
+        """Update every cloud in the cloud ensemble.
+
+        The clouds are only superposed again, if one of them has been
+        shifted or modified via item assignment or :py:meth:`Cloud.set`
+        since the last superposition. Changes written directly into the
+        arrays of a cloud are not detected; call :py:meth:`superpose` after
+        such modifications.
+        """
         for cloud in self._clouds:
             cloud.update_cloud_profile(*args, **kwargs)
 
-        self.superpose()
+        # Only superpose the clouds again, if any of them has changed since
+        # the last superposition of this ensemble.
+        if self._cloud_versions() != self._superposed_versions:
+            self.superpose()
+            self._profile_version += 1
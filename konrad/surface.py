@@ -96,8 +96,9 @@ class Surface(Component, metaclass=abc.ABCMeta):
         lapse = 0.0065
         t_sfc = atmosphere['T'][0, 0] + lapse * (z[0] - z_sfc)
 
-        return cls(temperature=t_sfc,
-                   height=z_sfc,
+        # Pass plain floats to skip the conversion of array scalars.
+        return cls(temperature=float(t_sfc),
+                   height=float(z_sfc),
                    **kwargs,
                    )
 
@@ -115,7 +116,7 @@ class Surface(Component, metaclass=abc.ABCMeta):
             else:
                 dataset = root
 
-            t = dataset['temperature'][timestep].data
+            t = float(dataset['temperature'][timestep])
             z = float(dataset['height'][:])
 
         # TODO: Should other variables (e.g. albedo) also be read?
@@ -169,11 +170,15 @@ class SurfaceHeatCapacity(Surface):
 
         net_flux = (sw_down - sw_up) + (lw_down - lw_up)
 
-        logger.debug(f'Net flux: {net_flux:.2f} W /m^2')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'Net flux: {net_flux:.2f} W /m^2')
 
-        self['temperature'] += (timestep * net_flux / self.heat_capacity)
+        # Update the values in place to bypass the item assignment.
+        self['temperature'][:] += timestep * net_flux / self.heat_capacity
 
-        logger.debug("Surface temperature: {self['temperature'][0]:.4f} K")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Surface temperature: {self['temperature'][0]:.4f} K")
 
 
 class SurfaceHeatSink(SurfaceHeatCapacity):
@@ -207,9 +212,13 @@ class SurfaceHeatSink(SurfaceHeatCapacity):
         net_flux = (sw_down - sw_up) + (lw_down - lw_up)
         sink = self.heat_flux
 
-        logger.debug(f'Net flux: {net_flux:.2f} W /m^2')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'Net flux: {net_flux:.2f} W /m^2')
 
-        self['temperature'] += (timestep * (net_flux - sink) /
-                                self.heat_capacity)
+        # Update the values in place to bypass the item assignment.
+        self['temperature'][:] += (timestep * (net_flux - sink) /
+                                   self.heat_capacity)
 
-        logger.debug("Surface temperature: {self['temperature'][0]:.4f} K")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Surface temperature: {self['temperature'][0]:.4f} K")
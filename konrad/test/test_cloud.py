@@ -0,0 +1,268 @@
+import numpy as np
+import pytest
+from sympl import DataArray
+
+from konrad.cloud import (
+    _LinearMultiInterp,
+    CloudEnsemble,
+    DirectInputCloud,
+    HighCloud,
+    LowCloud,
+    get_rectangular_profile,
+)
+from konrad.component import Component
+
+
+NUMLEVELS = 20
+
+
+def get_convection(convective_top_index):
+    """Return a minimal convection component with given convective top."""
+    convection = Component()
+    convection['convective_top_index'] = (
+        ('time',), np.array([convective_top_index], dtype=float))
+
+    return convection
+
+
+def get_cloud(cls, ztop, **kwargs):
+    """Return a rectangular cloud with a depth of three model levels."""
+    return cls(
+        numlevels=NUMLEVELS,
+        cloud_fraction=get_rectangular_profile(
+            np.arange(NUMLEVELS), 0.5, ztop, 4),
+        lw_optical_thickness=np.linspace(1, 2, cls.num_longwave_bands),
+        sw_optical_thickness=np.linspace(3, 4, cls.num_shortwave_bands),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def high_cloud():
+    # Cloud layers 9-11, coupled to a convective top at level 10.
+    return get_cloud(HighCloud, ztop=12, norm_index=10)
+
+
+@pytest.fixture
+def low_cloud():
+    # Cloud layers 2-4, fixed in pressure.
+    return get_cloud(LowCloud, ztop=5)
+
+
+class TestLinearMultiInterp:
+    xp = np.arange(5) - 2.
+    fp = np.arange(15, dtype=float).reshape(5, 3) ** 2
+
+    def test_matches_numpy_interp(self):
+        """Compare the interpolation of every column to `np.interp`."""
+        x = np.array([-2., -1.5, 0.25, 1., 2.])
+        interp = _LinearMultiInterp(self.xp, self.fp)
+
+        reference = np.stack(
+            [np.interp(x, self.xp, col) for col in self.fp.T], axis=-1)
+
+        assert np.allclose(interp(x), reference)
+
+    def test_axis(self):
+        """Check the interpolation along a non-leading axis."""
+        x = np.array([-1.5, 0.25, 1.])
+        fp = np.stack([self.fp, 2 * self.fp])
+        interp = _LinearMultiInterp(self.xp, fp, axis=1)
+
+        reference = _LinearMultiInterp(self.xp, self.fp)(x)
+
+        assert np.allclose(interp(x), np.stack([reference, 2 * reference]))
+
+    def test_zero_outside_grid(self):
+        """Check that values outside of the grid are set to zero."""
+        x = np.array([-3., -2.5, 2.5, 4.])
+        interp = _LinearMultiInterp(self.xp, self.fp)
+
+        assert np.all(interp(x) == 0)
+
+
+def test_get_rectangular_profile():
+    """Compare the rectangular profile to an explicit mask."""
+    z = np.linspace(0, 20e3, 41)
+    reference = np.where((z < 12e3) & (z > 12e3 - 4e3), 0.5, 0)
+
+    assert np.array_equal(get_rectangular_profile(z, 0.5, 12e3, 4e3),
+                          reference)
+    assert np.array_equal(get_rectangular_profile(z[::-1], 0.5, 12e3, 4e3),
+                          reference[::-1])
+
+
+def test_get_rectangular_profile_unsorted():
+    """Check rectangular profiles for unsorted and two-dimensional heights."""
+    z = np.random.RandomState(0).permutation(np.linspace(0, 20e3, 41))
+    reference = np.where((z < 12e3) & (z > 12e3 - 4e3), 0.5, 0)
+
+    assert np.array_equal(get_rectangular_profile(z, 0.5, 12e3, 4e3),
+                          reference)
+    assert np.array_equal(
+        get_rectangular_profile(z[np.newaxis, :], 0.5, 12e3, 4e3),
+        reference[np.newaxis, :])
+
+
+class TestCloud:
+    def test_dataarray_input(self):
+        """Check that DataArray inputs keep their coordinates and name."""
+        cloud_fraction = DataArray(
+            np.linspace(0, 1, NUMLEVELS),
+            dims=('mid_levels',),
+            coords={'mid_levels': np.arange(NUMLEVELS)},
+            name='cloud_fraction',
+            attrs={'units': 'dimensionless'},
+        )
+        cloud = get_cloud(DirectInputCloud, ztop=12)
+
+        dataarray = cloud.get_p_data_array(
+            cloud_fraction, out=np.empty(NUMLEVELS))
+
+        assert dataarray.name == 'cloud_fraction'
+        assert np.array_equal(dataarray.coords['mid_levels'],
+                              np.arange(NUMLEVELS))
+        assert np.array_equal(dataarray.values, cloud_fraction.values)
+
+    def test_dataarray_input_shape_mismatch(self):
+        """Check the exception for DataArray inputs of wrong shape."""
+        with pytest.raises(ValueError, match='shape mismatch'):
+            DirectInputCloud(
+                numlevels=NUMLEVELS,
+                cloud_fraction=DataArray(np.zeros(NUMLEVELS + 1),
+                                         dims=('mid_levels',)),
+                lw_optical_thickness=0,
+                sw_optical_thickness=0,
+            )
+
+        with pytest.raises(ValueError, match='shape mismatch'):
+            DirectInputCloud(
+                numlevels=NUMLEVELS,
+                cloud_fraction=0,
+                lw_optical_thickness=DataArray(
+                    np.zeros(NUMLEVELS), dims=('mid_levels',)),
+                sw_optical_thickness=0,
+            )
+
+
+class TestDirectInputCloud:
+    def test_shift_to_same_level(self, high_cloud):
+        """Check that shifting to the current level leaves the cloud as is."""
+        before = {
+            varname: high_cloud[varname].values.copy()
+            for varname in DirectInputCloud.direct_input_parameters
+        }
+
+        high_cloud.shift_cloud_profile(norm_new=10)
+
+        assert high_cloud._profile_version == 0
+        for varname, values in before.items():
+            assert np.array_equal(high_cloud[varname].values, values)
+
+    def test_shift(self, high_cloud):
+        """Check that the cloud profile is moved to the new level."""
+        cloud_fraction = high_cloud[
+            'cloud_area_fraction_in_atmosphere_layer'].values.copy()
+
+        high_cloud.shift_cloud_profile(norm_new=14)
+
+        assert np.array_equal(
+            high_cloud['cloud_area_fraction_in_atmosphere_layer'].values,
+            np.roll(cloud_fraction, 4),
+        )
+
+    @pytest.mark.parametrize('norm_new', [np.nan, None])
+    def test_shift_back_to_original_level(self, high_cloud, norm_new):
+        """Check that a missing level moves the cloud to `_norm_index`."""
+        before = {
+            varname: high_cloud[varname].values.copy()
+            for varname in DirectInputCloud.direct_input_parameters
+        }
+
+        high_cloud.shift_cloud_profile(norm_new=14)
+        high_cloud.shift_cloud_profile(norm_new=norm_new)
+
+        for varname, values in before.items():
+            assert np.allclose(high_cloud[varname].values, values)
+
+
+class TestCloudEnsemble:
+    def test_update_cloud_profile(self, high_cloud, low_cloud):
+        """Check that the ensemble reflects the shift of a member cloud."""
+        ensemble = CloudEnsemble(high_cloud, low_cloud)
+
+        ensemble.update_cloud_profile(
+            atmosphere=None, convection=get_convection(14), radiation=None)
+        summed = high_cloud + low_cloud
+
+        for _, varname in DirectInputCloud._superposition_name_map:
+            assert np.array_equal(ensemble[varname].values,
+                                  summed[varname].values)
+
+    def test_shared_member(self, high_cloud, low_cloud):
+        """Check that ensembles sharing a cloud are updated independently."""
+        other_low_cloud = get_cloud(LowCloud, ztop=4)
+        ensemble = CloudEnsemble(high_cloud, low_cloud)
+        other_ensemble = CloudEnsemble(high_cloud, other_low_cloud)
+
+        convection = get_convection(14)
+        for e in ensemble, other_ensemble:
+            e.update_cloud_profile(
+                atmosphere=None, convection=convection, radiation=None)
+
+        for e, summed in [(ensemble, high_cloud + low_cloud),
+                          (other_ensemble, high_cloud + other_low_cloud)]:
+            for _, varname in DirectInputCloud._superposition_name_map:
+                assert np.array_equal(e[varname].values,
+                                      summed[varname].values)
+
+    def test_set_member(self, high_cloud, low_cloud):
+        """Check that the ensemble reflects changes of a member via `set`."""
+        ensemble = CloudEnsemble(high_cloud, low_cloud)
+
+        low_cloud.set('cloud_area_fraction_in_atmosphere_layer', 0.9)
+        ensemble.update_cloud_profile(
+            atmosphere=None, convection=get_convection(10), radiation=None)
+        summed = high_cloud + low_cloud
+
+        for _, varname in DirectInputCloud._superposition_name_map:
+            assert np.array_equal(ensemble[varname].values,
+                                  summed[varname].values)
+        assert np.all(
+            ensemble['cloud_area_fraction_in_atmosphere_layer'].values == 0.9)
+
+    def test_skip_superposition(self, high_cloud, low_cloud, monkeypatch):
+        """Check that the ensemble is not superposed if nothing moved."""
+        ensemble = CloudEnsemble(high_cloud, low_cloud)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('Cloud ensemble superposed again.')
+
+        monkeypatch.setattr(CloudEnsemble, '_superpose_fast', fail)
+
+        ensemble.update_cloud_profile(
+            atmosphere=None, convection=get_convection(10), radiation=None)
+
+        assert ensemble._profile_version == 0
+
+    def test_superposition(self):
+        """Compare the ensemble superposition to successive cloud addition."""
+        numlevels = 10
+        clouds = [
+            DirectInputCloud(
+                numlevels=numlevels,
+                cloud_fraction=get_rectangular_profile(
+                    np.arange(numlevels), cf, ztop, 4),
+                lw_optical_thickness=lw,
+                sw_optical_thickness=sw,
+            )
+            for cf, ztop, lw, sw in [(0.3, 5, 1., 2.),
+                                     (0.5, 7, 3., 4.),
+                                     (0.5, 9, 5., 6.)]
+        ]
+        ensemble = CloudEnsemble(*clouds)
+        summed = clouds[0] + clouds[1] + clouds[2]
+
+        for _, varname in DirectInputCloud._superposition_name_map:
+            assert np.array_equal(ensemble[varname].values,
+                                  summed[varname].values)
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from konrad import (atmosphere, cloud, radiation, surface, utils)
+
+
+@pytest.fixture
+def atmosphere_obj():
+    _, phlev = utils.get_pressure_grids(surface_pressure=1000e2, num=50)
+
+    return atmosphere.Atmosphere(phlev=phlev)
+
+
+class TestRRTMG:
+    def test_nomcica_restores_cloud_fraction(self, atmosphere_obj):
+        """Check that the nomcica calculation restores the cloud fraction."""
+        numlevels = atmosphere_obj['plev'].size
+        cloud_fraction = cloud.get_rectangular_profile(
+            np.arange(numlevels), 0.3, 20, 5)
+        cloudy = cloud.PhysicalCloud(
+            numlevels=numlevels,
+            cloud_fraction=cloud_fraction,
+            mass_water=0,
+            mass_ice=cloud_fraction * 1e-2,
+            ice_particle_size=20,
+            droplet_radius=10,
+        )
+        before = np.copy(cloudy['cloud_area_fraction_in_atmosphere_layer'])
+
+        rrtmg = radiation.RRTMG(mcica=False)
+        rrtmg.calc_radiation(
+            atmosphere=atmosphere_obj,
+            surface=surface.SurfaceHeatCapacity.from_atmosphere(
+                atmosphere_obj),
+            cloud=cloudy,
+        )
+
+        assert np.array_equal(
+            cloudy['cloud_area_fraction_in_atmosphere_layer'].values, before)